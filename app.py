@@ -4,6 +4,7 @@ import altair as alt
 from datetime import datetime
 from harvesters import harvest_all
 from engine import process_data
+from models import load_vader, load_roberta, load_keybert
 
 
 st.set_page_config(
@@ -12,6 +13,27 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource(show_spinner=False)
+def get_vader():
+    return load_vader()
+
+@st.cache_resource(show_spinner=False)
+def get_roberta():
+    return load_roberta()
+
+@st.cache_resource(show_spinner=False)
+def get_keybert():
+    return load_keybert()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_analytics(raw_data):
+    return process_data(
+        raw_data,
+        roberta=get_roberta(),
+        vader=get_vader(),
+        keyword_model=get_keybert()
+    )
+
 def main():
 
     st.title("LeapPulse — Brand Perception Monitor")
@@ -43,7 +65,7 @@ def main():
 
     with st.spinner("Processing intelligence..."):
         try:
-            analytics = process_data(raw_data)
+            analytics = load_analytics(raw_data)
         except Exception as e:
             st.error(f"Failed to process data: {str(e)}")
             return
@@ -147,11 +169,7 @@ def main():
         
         if not negative_df.empty:
             if "timestamp" in negative_df.columns:
-                try:
-                    negative_df["timestamp"] = pd.to_datetime(negative_df["timestamp"], errors='coerce')
-                    negative_df = negative_df.sort_values(by="timestamp", ascending=False)
-                except Exception:
-                    pass
+                negative_df = negative_df.sort_values(by="timestamp", ascending=False)
 
             display_cols = ["source", "title", "timestamp", "url"]
             display_cols = [c for c in display_cols if c in negative_df.columns]
@@ -1,55 +1,75 @@
+import os
 import re
+import hashlib
+import sqlite3
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from collections import Counter
+from contextlib import closing
+from functools import lru_cache
+from models import ROBERTA_MODEL_NAME, load_vader, load_roberta, load_keybert
 
-# Global cache for models
-VADER_ANALYZER = None
-ROBERTA_PIPELINE = None
-KEYWORD_MODEL = None
-MODELS_LOADED = False
+ROBERTA_BATCH_SIZE = 32
+KEYBERT_MAX_CANDIDATES = 500
+MIN_SENTIMENT_CHARS = 3
 
-def _load_models():
-    """
-    Lazy load models safely.
-    Defensive imports to prevent crashing on missing dependencies or version mismatch.
-    """
-    global VADER_ANALYZER, ROBERTA_PIPELINE, KEYWORD_MODEL, MODELS_LOADED
-    
-    if MODELS_LOADED:
-        return
+# Default for model arguments: load the model lazily when the caller does
+# not pass one. An explicit None means "unavailable, use the fallback".
+DEFAULT_MODEL = object()
 
-    # 1. Load VADER (Pure Python, usually safe)
-    try:
-        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-        VADER_ANALYZER = SentimentIntensityAnalyzer()
-    except Exception:
-        VADER_ANALYZER = None
+# Text cleaning patterns
+_URL_RE = re.compile(r'http\S+|www\.\S+')
+_MENTION_RE = re.compile(r'@\w+')
+_WS_RE = re.compile(r'\s+')
 
-    # 2. Load Transformers (RoBERTa)
-    try:
-        from transformers import pipeline
-        # Use a specific, smaller model if possible, or catch failures
-        ROBERTA_PIPELINE = pipeline(
-            "sentiment-analysis", 
-            model="cardiffnlp/twitter-roberta-base-sentiment",
-            tokenizer="cardiffnlp/twitter-roberta-base-sentiment",
-            max_length=512, 
-            truncation=True
-        )
-    except Exception:
-        # Fallback to None if transformers/torch fails
-        ROBERTA_PIPELINE = None
+# Fallback keyword extraction: alphabetic words of 4+ letters
+_TOKEN_RE = re.compile(r'\b[a-z]{4,}\b', re.IGNORECASE)
+STOP_WORDS = frozenset({
+    'the', 'and', 'to', 'of', 'a', 'in', 'is', 'that', 'for', 'it', 'on', 
+    'with', 'as', 'are', 'was', 'this', 'by', 'at', 'be', 'or', 'from',
+    'an', 'not', 'you', 'we', 'have', 'can', 'has', 'but', 'if', 'leapscholar', 'leap', 'scholar',
+    'video', 'comments', 'watch', 'http', 'https', 'com', 'www', 'review', 'about'
+})
+
+# VADER lexicon fallback: word tokens and compound normalization constant
+# (inner apostrophes only, so quoted 'great' still hits the lexicon)
+_LEXICON_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)*")
+VADER_ALPHA = 15
+
+# Persistent RoBERTa label cache, keyed by (model variant, content digest)
+SENTIMENT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".sentiment_cache.sqlite3"
+)
 
-    # 3. Load KeyBERT
+@lru_cache(maxsize=None)
+def _default_model(loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """Load a default model once per process; failures stay cached as None."""
+    return loader()
+
+def _resolve_model(model: Any, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+    if model is DEFAULT_MODEL:
+        return _default_model(loader)
+    return model
+
+def _clean_text_series(series: pd.Series) -> pd.Series:
+    """
+    Vectorized text cleaning over a whole column.
+    Non-string values become empty strings.
+    """
     try:
-        from keybert import KeyBERT
-        KEYWORD_MODEL = KeyBERT()
-    except Exception:
-        # Fallback to None if torch/numpy/keybert fails
-        KEYWORD_MODEL = None
-        
-    MODELS_LOADED = True
+        text = series.astype(object).str
+    except AttributeError:
+        # Column holds no strings at all
+        return pd.Series("", index=series.index, dtype=object)
+
+    return (
+        text.replace(_URL_RE, '', regex=True)  # Remove URLs
+        .str.replace(_MENTION_RE, '', regex=True)  # Remove @mentions
+        .str.replace(_WS_RE, ' ', regex=True)  # Strip excessive whitespace
+        .str.strip()
+        .fillna("")
+    )
 
 def clean_records(records: List[Dict[str, Any]]) -> pd.DataFrame:
     """
@@ -60,113 +80,227 @@ def clean_records(records: List[Dict[str, Any]]) -> pd.DataFrame:
 
     df = pd.DataFrame(records)
 
-    def clean_text(text: Any) -> str:
-        if not isinstance(text, str):
-            return ""
-        # Remove URLs
-        text = re.sub(r'http\S+|www\.\S+', '', text, flags=re.MULTILINE)
-        # Remove @mentions
-        text = re.sub(r'@\w+', '', text)
-        # Strip excessive whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
-
     if 'title' in df.columns:
-        df['title'] = df['title'].apply(clean_text)
+        df['title'] = _clean_text_series(df['title'])
     else:
         df['title'] = ""
         
     if 'text' in df.columns:
-        df['text'] = df['text'].apply(clean_text)
+        df['text'] = _clean_text_series(df['text'])
     else:
         df['text'] = ""
 
     df['content'] = df['title'] + ". " + df['text']
 
+    # Parse once at ingestion so the dashboard gets datetime64 values
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce', utc=True, format='mixed')
+
     if 'url' in df.columns:
         df = df.drop_duplicates(subset=['url'])
 
+    # Syndicated news and crossposts share text under different URLs;
+    # keep the first-seen copy so sentiment runs once per distinct text.
+    # Near-empty content carries no text to compare, so those rows stay.
+    trivial = df['content'].str.strip().str.len() < MIN_SENTIMENT_CHARS
+    duplicate = df['content'].str.casefold().duplicated()
+    df = df.loc[trivial | ~duplicate].copy()
+
     return df
 
-def analyze_sentiment(df: pd.DataFrame) -> pd.DataFrame:
+def analyze_sentiment(
+    df: pd.DataFrame,
+    roberta: Optional[Any] = DEFAULT_MODEL,
+    vader: Optional[Any] = DEFAULT_MODEL
+) -> pd.DataFrame:
     """
-    Analyze sentiment using VADER logic (robust fallback).
+    Analyze sentiment with RoBERTa, using VADER as the robust fallback.
+    Omitted models are loaded lazily from models.py; pass None to skip one.
     """
-    _load_models()
-    
     if df.empty:
         df['sentiment'] = []
         return df
 
-    sentiments = []
-    
+    sentiments = ["neutral"] * len(df)
+
+    contents = df['content'].astype(str).tolist() if 'content' in df.columns else [""] * len(df)
+    # Empty or near-empty content (e.g. the bare ". " joiner) stays neutral
+    # and never takes a slot in a RoBERTa batch
+    idxs = [
+        pos for pos, content in enumerate(contents)
+        if len(content.strip()) >= MIN_SENTIMENT_CHARS
+    ]
+    texts = [contents[pos] for pos in idxs]
+
+    if texts:
+        labels = None
+
+        # Prio 1: Transformers for every source, in one batch
+        roberta = _resolve_model(roberta, load_roberta)
+        if roberta:
+            try:
+                labels = _cached_roberta_sentiments(texts, roberta)
+            except Exception:
+                labels = None
+
+        # Prio 2: VADER if RoBERTa is unavailable or fails
+        if labels is None:
+            labels = _vader_sentiments(texts, _resolve_model(vader, load_vader))
+
+        for pos, label in zip(idxs, labels):
+            sentiments[pos] = label
+
+    df['sentiment'] = sentiments
+    return df
+
+def _content_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _cache_connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(SENTIMENT_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sentiment ("
+        "model TEXT NOT NULL, digest TEXT NOT NULL, label TEXT NOT NULL, "
+        "PRIMARY KEY (model, digest))"
+    )
+    return conn
+
+def _cache_model_key(roberta: Any) -> str:
+    """Model name plus backend/precision, since int8/bf16 can flip labels."""
+    return f"{ROBERTA_MODEL_NAME}:{getattr(roberta, 'roberta_variant', 'unknown')}"
+
+def _cache_lookup(model_key: str, digests: List[str]) -> Dict[str, str]:
+    """Return cached labels for the given digests; misses are omitted."""
+    found = {}
+    try:
+        with closing(_cache_connect()) as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(digests), 500):
+                chunk = digests[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT digest, label FROM sentiment "
+                    f"WHERE model = ? AND digest IN ({placeholders})",
+                    [model_key, *chunk]
+                )
+                found.update(rows)
+    except Exception:
+        return {}
+    return found
+
+def _cache_store(model_key: str, labels: Dict[str, str]) -> None:
+    try:
+        with closing(_cache_connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sentiment (model, digest, label) VALUES (?, ?, ?)",
+                [(model_key, digest, label) for digest, label in labels.items()]
+            )
+    except Exception:
+        pass
+
+def _cached_roberta_sentiments(texts: List[str], roberta: Any) -> List[str]:
+    """
+    RoBERTa labels with a persistent cache in front.
+    Only texts not seen before are sent through the model.
+    """
+    model_key = _cache_model_key(roberta)
+    digests = [_content_digest(t) for t in texts]
+    labels = _cache_lookup(model_key, digests)
+
+    misses = [i for i, digest in enumerate(digests) if digest not in labels]
+    if misses:
+        fresh = _roberta_sentiments([texts[i] for i in misses], roberta)
+        new_labels = {digests[i]: label for i, label in zip(misses, fresh)}
+        _cache_store(model_key, new_labels)
+        labels.update(new_labels)
+
+    return [labels[digest] for digest in digests]
+
+def _roberta_sentiments(texts: List[str], roberta: Any) -> List[str]:
+    """
+    Run RoBERTa over texts in length-sorted batches.
+    Sorting by token length keeps padding within each batch minimal;
+    labels are returned in the original order.
+    """
+    import torch
+
     roberta_map = {
         "LABEL_0": "negative",
         "LABEL_1": "neutral",
         "LABEL_2": "positive"
     }
 
-    for idx, row in df.iterrows():
-        source = row.get('source', '')
-        content = row.get('content', '')
-        
-        if not str(content).strip():
-            sentiments.append("neutral")
-            continue
+    tokenizer = roberta.tokenizer
+    model = roberta.model
 
-        sentiment_res = "neutral"
+    encoded = tokenizer(texts, truncation=True, max_length=512, return_length=True)
+    order = sorted(range(len(texts)), key=lambda i: encoded['length'][i])
 
-        try:
-            # Prio 1: Transformers for detailed text (if available and not youtube)
-            if source != 'youtube' and ROBERTA_PIPELINE:
-                try:
-                    # Truncate safely
-                    safe_content = content[:1000] 
-                    result = ROBERTA_PIPELINE(safe_content)
-                    # Pipeline can return list of dicts or dict depending on version/args
-                    if isinstance(result, list):
-                        label = result[0]['label']
-                    else:
-                        label = result['label']
-                    sentiment_res = roberta_map.get(label, "neutral")
-                except Exception:
-                    sentiment_res = _vader_sentiment(content)
-            
-            # Prio 2: VADER
-            else:
-                sentiment_res = _vader_sentiment(content)
+    sentiments = ["neutral"] * len(texts)
+    with torch.no_grad():
+        for start in range(0, len(order), ROBERTA_BATCH_SIZE):
+            chunk = order[start:start + ROBERTA_BATCH_SIZE]
+            batch = tokenizer.pad(
+                {
+                    "input_ids": [encoded['input_ids'][i] for i in chunk],
+                    "attention_mask": [encoded['attention_mask'][i] for i in chunk]
+                },
+                return_tensors="pt"
+            ).to(model.device)
 
-        except Exception:
-            sentiment_res = "neutral"
-            
-        sentiments.append(sentiment_res)
+            logits = model(**batch).logits
+            preds = torch.softmax(logits, dim=-1).argmax(dim=-1).tolist()
 
-    df['sentiment'] = sentiments
-    return df
+            for i, pred in zip(chunk, preds):
+                label = model.config.id2label.get(pred, "")
+                sentiments[i] = roberta_map.get(label, "neutral")
+
+    return sentiments
+
+def _vader_sentiments(texts: List[str], vader: Optional[Any]) -> List[str]:
+    """
+    Label texts from the VADER lexicon with a single numpy pass.
+    Sums word valences per text and applies VADER's compound normalization;
+    booster/negation heuristics are skipped since only the label is needed.
+    """
+    if not vader:
+        return ["neutral"] * len(texts)
 
-def _vader_sentiment(text: str) -> str:
-    """Helper for VADER scoring"""
-    if not VADER_ANALYZER:
-        return "neutral"
-    
     try:
-        scores = VADER_ANALYZER.polarity_scores(text)
-        compound = scores.get('compound', 0)
-        if compound >= 0.05:
-            return 'positive'
-        elif compound <= -0.05:
-            return 'negative'
-        else:
-            return 'neutral'
+        lexicon = vader.lexicon
+        token_lists = [_LEXICON_TOKEN_RE.findall(text.lower()) for text in texts]
+
+        counts = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.intp, count=len(texts))
+        valences = np.fromiter(
+            (lexicon.get(token, 0.0) for tokens in token_lists for token in tokens),
+            dtype=np.float64,
+            count=int(counts.sum())
+        )
+
+        totals = np.zeros(len(texts))
+        nonempty = counts > 0
+        if nonempty.any():
+            starts = np.cumsum(counts) - counts
+            totals[nonempty] = np.add.reduceat(valences, starts[nonempty])
+
+        compound = totals / np.sqrt(totals * totals + VADER_ALPHA)
+        labels = np.where(
+            compound >= 0.05,
+            'positive',
+            np.where(compound <= -0.05, 'negative', 'neutral')
+        )
+        return labels.tolist()
     except Exception:
-        return "neutral"
+        return ["neutral"] * len(texts)
 
-def extract_trends(df: pd.DataFrame) -> List[Tuple[str, float]]:
+def extract_trends(
+    df: pd.DataFrame,
+    keyword_model: Optional[Any] = DEFAULT_MODEL
+) -> List[Tuple[str, float]]:
     """
     Extract trends using KeyBERT or simple frequency fallback.
+    An omitted keyword_model is loaded lazily; pass None to skip KeyBERT.
     """
-    _load_models()
-    
     if df.empty:
         return []
     
@@ -179,12 +313,19 @@ def extract_trends(df: pd.DataFrame) -> List[Tuple[str, float]]:
         return []
 
     # Method 1: KeyBERT
-    if KEYWORD_MODEL:
+    keyword_model = _resolve_model(keyword_model, load_keybert)
+    if keyword_model:
         try:
-            keywords = KEYWORD_MODEL.extract_keywords(
-                full_text,
-                keyphrase_ngram_range=(1, 2),
+            from sklearn.feature_extraction.text import CountVectorizer
+            # Only the most frequent candidates get embedded
+            vectorizer = CountVectorizer(
+                ngram_range=(1, 2),
                 stop_words='english',
+                max_features=KEYBERT_MAX_CANDIDATES
+            )
+            keywords = keyword_model.extract_keywords(
+                full_text,
+                vectorizer=vectorizer,
                 top_n=10
             )
             return keywords
@@ -199,21 +340,8 @@ def _simple_keyword_extraction(text: str) -> List[Tuple[str, float]]:
     Fallback keyword extraction using word frequency.
     """
     try:
-        stop_words = {
-            'the', 'and', 'to', 'of', 'a', 'in', 'is', 'that', 'for', 'it', 'on', 
-            'with', 'as', 'are', 'was', 'this', 'by', 'at', 'be', 'or', 'from',
-            'an', 'not', 'you', 'we', 'have', 'can', 'has', 'but', 'if', 'leapscholar', 'leap', 'scholar',
-            'video', 'comments', 'watch', 'http', 'https', 'com', 'www', 'review', 'about'
-        }
-        
-        words = re.findall(r'\w+', text.lower())
-        
-        filtered_words = [
-            w for w in words 
-            if len(w) > 3 and w not in stop_words and not w.isdigit()
-        ]
-        
-        counter = Counter(filtered_words)
+        tokens = (m.group(0).lower() for m in _TOKEN_RE.finditer(text))
+        counter = Counter(w for w in tokens if w not in STOP_WORDS)
         total = sum(counter.values()) if counter else 1
         
         return [(word, count/total) for word, count in counter.most_common(10)]
@@ -221,9 +349,16 @@ def _simple_keyword_extraction(text: str) -> List[Tuple[str, float]]:
     except Exception:
         return []
 
-def process_data(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+def process_data(
+    records: List[Dict[str, Any]],
+    roberta: Optional[Any] = DEFAULT_MODEL,
+    vader: Optional[Any] = DEFAULT_MODEL,
+    keyword_model: Optional[Any] = DEFAULT_MODEL
+) -> Dict[str, Any]:
     """
     Orchestrator for data processing.
+    Models that are not passed in are loaded lazily (once per process) from
+    models.py; pass None explicitly to force the fallback path.
     """
     response = {
         "cleaned_records": [],
@@ -235,13 +370,13 @@ def process_data(records: List[Dict[str, Any]]) -> Dict[str, Any]:
         df_clean = clean_records(records)
         
         try:
-            df_analyzed = analyze_sentiment(df_clean)
+            df_analyzed = analyze_sentiment(df_clean, roberta=roberta, vader=vader)
         except Exception:
             df_analyzed = df_clean
             df_analyzed['sentiment'] = "neutral"
             
         try:
-            trends = extract_trends(df_analyzed)
+            trends = extract_trends(df_analyzed, keyword_model=keyword_model)
         except Exception:
             trends = []
             
@@ -0,0 +1,30 @@
+"""
+One-off export of the RoBERTa sentiment model to dynamic-int8 ONNX.
+
+Run once per deployment, and again after changing ROBERTA_MODEL_NAME:
+
+    python export_onnx.py
+
+models.load_roberta picks the result up from ONNX_MODEL_DIR on CPU hosts
+and falls back to PyTorch when it is missing.
+"""
+from models import ONNX_MODEL_DIR, ROBERTA_MODEL_NAME
+
+def main() -> None:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    ort_model = ORTModelForSequenceClassification.from_pretrained(
+        ROBERTA_MODEL_NAME,
+        export=True
+    )
+    quantizer = ORTQuantizer.from_pretrained(ort_model)
+    # AVX2 preset runs on any x86-64 host; ORT still uses VNNI kernels if present
+    quantizer.quantize(
+        save_dir=ONNX_MODEL_DIR,
+        quantization_config=AutoQuantizationConfig.avx2(is_static=False)
+    )
+    print(f"Saved int8 ONNX model to {ONNX_MODEL_DIR}")
+
+if __name__ == "__main__":
+    main()
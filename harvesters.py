@@ -2,8 +2,14 @@ import os
 import datetime
 import socket
 import re
+import time
+from functools import partial
 from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import httplib2
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser  
 from googleapiclient.discovery import build  
 from googleapiclient.errors import HttpError  
@@ -13,24 +19,76 @@ socket.setdefaulttimeout(5)
 
 load_dotenv()
 
+def _build_session() -> requests.Session:
+    """
+    Shared HTTP session so Reddit and Google News reuse pooled connections.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        # Retry connection failures only; HTTP statuses and read timeouts
+        # are left to the harvesters
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=0,
+            status=0,
+            backoff_factor=0.3,
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        # Reddit prefers identifiable User-Agent strings
+        "User-Agent": "python:LeapPulseBrandMonitor:v1.0 (by /u/yourusername)"
+    })
+    return session
+
+_SESSION = _build_session()
+
 def load_api_keys() -> None:
     """Load environment variables."""
     load_dotenv()
 
+# leapscholar | leap scholar | leap finance | leap ielts
+_BRAND_RE = re.compile(r"\bleap(?:scholar| scholar| finance| ielts)\b", re.IGNORECASE)
+
 def _is_relevant(text: str) -> bool:
     if not text:
         return False
 
-    text = text.lower()
+    return _BRAND_RE.search(text) is not None
+
+def _fetch_comments(youtube: Any, video_id: str) -> str:
+    """
+    Fetch the top comments of a video joined into one string.
+    Safe to call from worker threads: the shared client only builds the
+    request, and each call executes it on its own Http object.
+    """
+    if not video_id:
+        return ""
 
-    patterns = [
-        r"\bleapscholar\b",
-        r"\bleap scholar\b",
-        r"\bleap finance\b",
-        r"\bleap ielts\b",
-    ]
+    try:
+        comment_response = youtube.commentThreads().list(
+            part="snippet",
+            videoId=video_id,
+            maxResults=2,
+            textFormat="plainText"
+        ).execute(http=httplib2.Http(timeout=5))
+    except Exception:
+        return ""
 
-    return any(re.search(pattern, text) for pattern in patterns)
+    comments_list = []
+    for item in comment_response.get("items", []):
+        try:
+            comment = item["snippet"]["topLevelComment"]["snippet"]["textDisplay"]
+            comments_list.append(comment)
+        except Exception:
+            continue
+
+    return " | ".join(comments_list)
 
 def harvest_youtube() -> List[Dict[str, Any]]:
     """
@@ -55,7 +113,14 @@ def harvest_youtube() -> List[Dict[str, Any]]:
             order="date"
         ).execute()
 
-        for search_result in search_response.get("items", []):
+        items = search_response.get("items", [])
+        video_ids = [item.get("id", {}).get("videoId", "") for item in items]
+
+        # Comment threads are independent round-trips; fetch them concurrently
+        with ThreadPoolExecutor(max_workers=max(len(video_ids), 1)) as executor:
+            comments = list(executor.map(partial(_fetch_comments, youtube), video_ids))
+
+        for search_result, comments_text in zip(items, comments):
             try:
                 video_id = search_result["id"]["videoId"]
                 snippet = search_result["snippet"]
@@ -64,29 +129,6 @@ def harvest_youtube() -> List[Dict[str, Any]]:
                 published_at = snippet.get("publishedAt", "")
                 video_url = f"https://www.youtube.com/watch?v={video_id}"
 
-                # Fetch comments
-                comments_text = ""
-                try:
-                    comment_response = youtube.commentThreads().list(
-                        part="snippet",
-                        videoId=video_id,
-                        maxResults=2,
-                        textFormat="plainText"
-                    ).execute()
-                    
-                    comments_list = []
-                    for item in comment_response.get("items", []):
-                        try:
-                            comment = item["snippet"]["topLevelComment"]["snippet"]["textDisplay"]
-                            comments_list.append(comment)
-                        except Exception:
-                            continue
-                            
-                    if comments_list:
-                        comments_text = " | ".join(comments_list)
-                except Exception:
-                    pass
-
                 full_text = f"{description}\nComments: {comments_text}"
                 
                 # Strict Filter
@@ -115,8 +157,6 @@ def harvest_reddit() -> List[Dict[str, Any]]:
     """
     Search Reddit site-wide via JSON endpoint.
     """
-    import time
-
     results = []
 
     url = (
@@ -125,16 +165,11 @@ def harvest_reddit() -> List[Dict[str, Any]]:
         '&sort=new&limit=25'
     )
 
-    headers = {
-        # Reddit prefers identifiable User-Agent strings
-        "User-Agent": "python:LeapPulseBrandMonitor:v1.0 (by /u/yourusername)"
-    }
-
     try:
         # Small delay to reduce rate-limiting risk on cloud IP
         time.sleep(1)
 
-        resp = requests.get(url, headers=headers, timeout=8)
+        resp = _SESSION.get(url, timeout=8)
 
         if resp.status_code == 429:
             print("Reddit rate limited (429)")
@@ -165,7 +200,7 @@ def harvest_reddit() -> List[Dict[str, Any]]:
                 timestamp = ""
                 if created_utc:
                     timestamp = datetime.datetime.fromtimestamp(
-                        created_utc
+                        created_utc, tz=datetime.timezone.utc
                     ).isoformat()
 
                 full_text = selftext
@@ -202,7 +237,7 @@ def harvest_google_news() -> List[Dict[str, Any]]:
 
     try:
         try:
-            resp = requests.get(feed_url, timeout=5)
+            resp = _SESSION.get(feed_url, timeout=5)
             if resp.status_code != 200:
                 return []
             content = resp.content
@@ -229,8 +264,7 @@ def harvest_google_news() -> List[Dict[str, Any]]:
             
             if hasattr(entry, "published_parsed") and entry.published_parsed:
                 try:
-                    dt = datetime.datetime(*entry.published_parsed[:6])
-                    timestamp = dt.isoformat()
+                    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", entry.published_parsed)
                 except Exception:
                     pass
 
@@ -262,24 +296,15 @@ def harvest_all() -> List[Dict[str, Any]]:
     
     all_data = []
 
-   
-    try:
-        yt_data = harvest_youtube()
-        all_data.extend(yt_data)
-    except Exception:
-        pass
-            
-    try:
-        reddit_data = harvest_reddit()
-        all_data.extend(reddit_data)
-    except Exception:
-        pass
-        
+    # Sources are independent network calls; overlap their latency
+    harvesters = (harvest_youtube, harvest_reddit, harvest_google_news)
+    with ThreadPoolExecutor(max_workers=len(harvesters)) as executor:
+        futures = [executor.submit(harvester) for harvester in harvesters]
 
-    try:
-        news_data = harvest_google_news()
-        all_data.extend(news_data)
-    except Exception:
-        pass
+        for future in futures:
+            try:
+                all_data.extend(future.result())
+            except Exception:
+                pass
             
     return all_data
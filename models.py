@@ -0,0 +1,122 @@
+import os
+from typing import Any, Optional
+
+ROBERTA_MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment"
+
+# Local int8 ONNX export of ROBERTA_MODEL_NAME, produced by export_onnx.py
+ONNX_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    ".onnx",
+    ROBERTA_MODEL_NAME.replace("/", "--") + "-int8"
+)
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+def load_vader() -> Optional[Any]:
+    """
+    Load the VADER analyzer (pure Python, usually safe).
+    Returns None if vaderSentiment is unavailable.
+    """
+    try:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+    except Exception:
+        return None
+
+def _load_torch_roberta(dtype: Any) -> Any:
+    """
+    Load the PyTorch RoBERTa model with fused attention where available.
+    """
+    from transformers import AutoModelForSequenceClassification
+
+    try:
+        # Fused SDPA attention kernels where transformers supports them
+        model = AutoModelForSequenceClassification.from_pretrained(
+            ROBERTA_MODEL_NAME,
+            torch_dtype=dtype,
+            attn_implementation="sdpa"
+        )
+    except Exception:
+        model = AutoModelForSequenceClassification.from_pretrained(
+            ROBERTA_MODEL_NAME,
+            torch_dtype=dtype
+        )
+        try:
+            from optimum.bettertransformer import BetterTransformer
+            model = BetterTransformer.transform(model)
+        except Exception:
+            pass
+    model.eval()
+    return model
+
+def _load_onnx_roberta() -> Any:
+    """
+    Load the dynamic-int8 ONNX Runtime export of RoBERTa for CPU inference.
+    Raises if export_onnx.py has not been run for ROBERTA_MODEL_NAME.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    if not os.path.isfile(os.path.join(ONNX_MODEL_DIR, ONNX_MODEL_FILE)):
+        raise FileNotFoundError(f"No ONNX export in {ONNX_MODEL_DIR}")
+
+    return ORTModelForSequenceClassification.from_pretrained(
+        ONNX_MODEL_DIR,
+        file_name=ONNX_MODEL_FILE
+    )
+
+def load_roberta() -> Optional[Any]:
+    """
+    Load the RoBERTa sentiment pipeline.
+    CUDA gets a bf16 PyTorch model; CPU prefers the int8 ONNX Runtime export
+    when export_onnx.py has produced one.
+    The loaded backend/precision is recorded on the pipeline as roberta_variant.
+    Defensive imports to prevent crashing on missing dependencies or version mismatch.
+    """
+    try:
+        import torch
+        from transformers import AutoTokenizer, pipeline
+
+        use_cuda = torch.cuda.is_available()
+        tokenizer = AutoTokenizer.from_pretrained(ROBERTA_MODEL_NAME)
+
+        if not use_cuda:
+            try:
+                roberta = pipeline(
+                    "sentiment-analysis",
+                    model=_load_onnx_roberta(),
+                    tokenizer=tokenizer,
+                    max_length=512,
+                    truncation=True
+                )
+                roberta.roberta_variant = "onnx-int8"
+                return roberta
+            except Exception:
+                # optimum/onnxruntime missing, no export on disk or pipeline
+                # rejected the ORT model; use PyTorch instead
+                pass
+
+        # bf16 halves weight bytes on GPU; CPU stays on fp32
+        model = _load_torch_roberta(torch.bfloat16 if use_cuda else torch.float32)
+        roberta = pipeline(
+            "sentiment-analysis",
+            model=model,
+            tokenizer=tokenizer,
+            device=0 if use_cuda else -1,
+            max_length=512,
+            truncation=True
+        )
+        roberta.roberta_variant = "torch-bf16-cuda" if use_cuda else "torch-fp32"
+        return roberta
+    except Exception:
+        # Fallback to None if transformers/torch fails
+        return None
+
+def load_keybert() -> Optional[Any]:
+    """
+    Load the KeyBERT keyword model.
+    Returns None if torch/numpy/keybert fails.
+    """
+    try:
+        from keybert import KeyBERT
+        return KeyBERT()
+    except Exception:
+        return None